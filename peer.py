@@ -3,8 +3,10 @@ Peer Node for Gossipbased P2P Network
 
 Key design features:
   - Peer list is taken directly from REGISTER_RESPONSE (no separate PEER_LIST_REQUEST).
-  - The seed socket is handed to a background listener ONLY after all synchronous
+  - The seed socket is handed to the event loop ONLY after all synchronous
     req/response exchanges are complete, eliminating read races.
+  - A single selectors event loop thread reads every peer & seed socket
+    (no thread per connection).
   - Ping failures AND missing PONG replies both increment the missed-ping counter.
 
 Protocol: 4 byte big endian length + JSON payload 
@@ -13,35 +15,54 @@ to use:  python peer.py <IP> <Port>
 
 import sys
 import os
-import csv
 import json
 import socket
 import struct
+import selectors
 import threading
 import time
 import random
 import hashlib
+import heapq
+import itertools
+import collections
 import logging
+import logging.handlers
+from dataclasses import dataclass
+import queue
 import subprocess
 import platform
 
 # Framing
 HEADER_SIZE = 4
+_HDR = struct.Struct(">I")
+# Compact separators: no whitespace on the wire, same JSON payloads
+_ENC = json.JSONEncoder(separators=(",", ":"))
 
-def send_msg(sock: socket.socket,data: dict) -> bool:
+def encode_frame(data: dict) -> bytes:
+    """Header + payload bytes, build once when the same msg goes to many sockets"""
+    payload= _ENC.encode(data).encode()
+    return _HDR.pack(len(payload)) +payload
+
+def send_frame(sock: socket.socket, frame: bytes) -> bool:
     try:
-        payload= json.dumps(data).encode()
-        sock.sendall(struct.pack(">I", len(payload)) +payload)
+        sock.sendall(frame)
         return True
     except Exception:
         return False
 
+def send_msg(sock: socket.socket,data: dict) -> bool:
+    try:
+        return send_frame(sock, encode_frame(data))
+    except Exception:
+        return False
+
 def recv_msg(sock: socket.socket):
     try:
         raw= _recv_exact(sock,HEADER_SIZE)
         if not raw:
             return None
-        n= struct.unpack(">I", raw)[0]
+        n= _HDR.unpack(raw)[0]
         raw= _recv_exact(sock, n)
         if not raw:
             return None
@@ -50,29 +71,146 @@ def recv_msg(sock: socket.socket):
         return None
 
 
+def parse_frames(buf: bytearray) -> list:
+    """Pop every complete frame off the front of buf, return the decoded msgs.
+    A trailing partial frame stays in buf for the next read."""
+    msgs = []
+    off = 0
+    while len(buf) - off >= HEADER_SIZE:
+        n = _HDR.unpack_from(buf, off)[0]
+        end = off + HEADER_SIZE + n
+        if len(buf) < end:
+            break
+        msgs.append(json.loads(buf[off + HEADER_SIZE:end]))
+        off = end
+    del buf[:off]
+    return msgs
+
+
 def _recv_exact(sock: socket.socket, n: int):
-    buf = b""
-    while len(buf) < n:
-        chunk= sock.recv(n - len(buf))
-        if not chunk:
+    """Read exactly n bytes straight into one preallocated buffer (no concat copies)"""
+    buf = bytearray(n)
+    mv = memoryview(buf)
+    got = 0
+    while got < n:
+        r= sock.recv_into(mv[got:], n - got)
+        if not r:
             return None
-        buf+= chunk
+        got+= r
     return buf
 
 
-# System level ICMP ping helper
-def system_ping(host: str) -> bool:
-    """Return True if host replies to one ICMP ping within 1 s."""
-    if platform.system().lower()== "windows":
-        cmd= ["ping", "-n","1", "-w","1000",host]
-    else:
-        cmd= ["ping", "-c","1", "-W","1",host]
+# Socket tuning: frames are tiny, send them at once instead of letting Nagle
+# hold them back for up to ~40 ms waiting for an ACK
+SNDBUF_SIZE = 65536
+
+def tune_socket(sock: socket.socket):
     try:
-        r= subprocess.run(cmd, stdout=subprocess.DEVNULL,
-                           stderr=subprocess.DEVNULL, timeout=3)
-        return r.returncode == 0
-    except Exception:
-        return False
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SNDBUF_SIZE)
+        if hasattr(socket, "TCP_QUICKACK"):  # Linux only, no delayed ACK on PING/PONG
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except OSError:
+        pass
+
+
+# Gossip dedup key: 16 byte BLAKE2b digest of the message content
+def gossip_digest(content: str) -> bytes:
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+
+# ICMP echo helpers
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY   = 0
+_ICMP_HDR = struct.Struct("!BBHHH")  # type, code, checksum, id, seq
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def open_icmp_socket():
+    """Unprivileged ICMP datagram socket, or None where the OS does not allow it
+    (Windows, or Linux outside net.ipv4.ping_group_range)."""
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        s.setblocking(False)
+        return s
+    except OSError:
+        return None
+
+
+def icmp_echo_request(seq: int) -> bytes:
+    ident = os.getpid() & 0xFFFF
+    hdr = _ICMP_HDR.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    return _ICMP_HDR.pack(ICMP_ECHO_REQUEST, 0, _icmp_checksum(hdr), ident, seq)
+
+
+def icmp_reply_seq(data: bytes):
+    """Sequence number of an echo reply, None for any other packet."""
+    if data and data[0] >> 4 == 4:  # macOS hands back the IP header too
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < _ICMP_HDR.size:
+        return None
+    typ, _, _, _, seq = _ICMP_HDR.unpack_from(data)
+    return seq if typ == ICMP_ECHO_REPLY else None
+
+
+def system_ping_all(hosts, timeout: float = 1.0) -> set:
+    """Fallback: run one `ping` process per host concurrently, return the hosts that replied."""
+    windows = platform.system().lower() == "windows"
+    procs = {}
+    for host in hosts:
+        if windows:
+            cmd= ["ping", "-n","1", "-w",str(int(timeout * 1000)),host]
+        else:
+            cmd= ["ping", "-c","1", "-W",str(max(1, int(timeout))),host]
+        try:
+            procs[host] = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                           stderr=subprocess.DEVNULL)
+        except Exception:
+            pass
+
+    alive = set()
+    deadline = time.monotonic() + timeout + 2
+    for host, p in procs.items():
+        try:
+            if p.wait(timeout=max(0.0, deadline - time.monotonic())) == 0:
+                alive.add(host)
+        except subprocess.TimeoutExpired:
+            p.kill()
+            p.wait()
+    return alive
+
+
+# Per socket state for the event loop
+class _Conn:
+    """kind is "inbound", "neighbour", "seed", "icmp", or "connecting" while an
+    outbound connect is in flight (attempt counts its retries). rx holds a
+    partial frame."""
+    __slots__ = ("sock", "kind", "peer_key", "rx", "attempt")
+
+    def __init__(self, sock: socket.socket, kind: str, peer_key: tuple | None = None,
+                 attempt: int = 0):
+        self.sock = sock
+        self.kind = kind
+        self.peer_key = peer_key
+        self.rx = bytearray()
+        self.attempt = attempt
+
+
+# Per neighbour state, one dict lookup per PING/PONG/suspicion event
+@dataclass(slots=True)
+class PeerState:
+    """sock is None once the connection is gone but a suspicion is still open."""
+    sock: socket.socket | None = None
+    missed: int = 0                  # consecutive missed pings
+    ponged: bool = False             # PONG seen this liveness round
+    suspicion: dict | None = None    # {confirmations:set, reported:bool}
 
 
 # PeerNode registers w seeds,selects powerlaw nbours,gossips & participates in 2level deadnode detection
@@ -83,7 +221,7 @@ class PeerNode:
     2. For each chosen seed:
          a. Connect (TCP)
          b. REGISTER_REQUEST to REGISTER_RESPONSE (contains peer list)
-         c. Keep socket, start background listener for DEAD_CONFIRMED etc.
+         c. Keep socket, register it with the event loop for DEAD_CONFIRMED etc.
     3. Union of peer lists from all successful seeds to select neighbours
     4. Connect to neighbours (TCP, send HELLO)
     5. Start gossip loop + liveness loop
@@ -94,6 +232,10 @@ class PeerNode:
     PING_INTERVAL     = 8    # seconds between ping rounds
     PING_MISS_THRESH  = 3    # consecutive missed pings before suspicion
     SUSPECT_TIMEOUT   = 20   # secs to wait for peer suspicion confirmations
+    ML_CAPACITY       = 4096 # max digests kept in the Message List
+    RECV_SIZE         = 65536 # max bytes read per readable event
+    CONNECT_RETRIES   = 5    # connect attempts per neighbour
+    CONNECT_TIMEOUT   = 5    # secs before an in-flight connect attempt is dropped
 
     def __init__(self, host: str, port: int, config_path: str = "config.csv"):
         self.host =host
@@ -105,43 +247,90 @@ class PeerNode:
         self.n_seeds =len(self.all_seeds)
         self.quorum =(self.n_seeds // 2) + 1
 
-        # Message List hashes of all gossip messages seen
-        self.ml: set[str] = set()
-        self.ml_lock= threading.Lock()
+        # One lock guards all shared state below. Single dict/set operations
+        # (get, set, pop, add) are atomic under the GIL and may skip it, but
+        # snapshots (tuple(self.peers...)) and read-modify-write sequences
+        # must hold it. Reentrant so helpers can be called with it held.
+        self._lock = threading.RLock()
 
-        # Neighbours are (ip,port) -> socket
-        self.neighbours: dict[tuple, socket.socket] = {}
-        self.nbr_lock= threading.Lock()
+        # Message List raw digests of recent gossip, oldest evicted first
+        self.ml: set[bytes] = set()
+        self.ml_ring: collections.deque = collections.deque()
+
+        # Neighbours are (ip,port) -> PeerState (socket, liveness, suspicion)
+        self.peers: dict[tuple, PeerState] = {}
 
         # Seed sockets are (ip,port) -> socket (kept open for DEAD_CONFIRMED)
         self.seed_socks: dict[tuple, socket.socket] = {}
-        self.seed_lock= threading.Lock()
-
-        # Liveness
-        self.missed_pings: dict[tuple, int] = {}
-        self.mp_lock= threading.Lock()
-        # pong_received: set of peer_keys that sent PONG this round
-        self.pong_received: set[tuple] = set()
-        self.pong_lock= threading.Lock()
 
-        # Suspicion state: peer_key -> {confirmations:set, reported:bool}
-        self.suspected: dict[tuple, dict] = {}
-        self.susp_lock= threading.Lock()
+        # Liveness, current round: _round_done is set once the expected number
+        # of PONGs and ICMP replies are in, so the loop need not sleep it out
+        self._round_pongs = 0
+        self._pongs_in = 0
+        self._round_hosts = 0
+        self._round_done = threading.Event()
 
         # Gossip counter
         self.gossip_count= 0
-        self.gc_lock= threading.Lock()
+
+        # Control frames depend only on host/port, encoded once for the node
+        self._ping_frame = encode_frame({"type": "PING",
+                                         "from_ip": self.host, "from_port": self.port})
+        self._pong_frame = encode_frame({"type": "PONG",
+                                         "from_ip": self.host, "from_port": self.port})
+        self._hello_frame = encode_frame({"type": "HELLO",
+                                          "ip": self.host, "port": self.port})
+
+        # Event loop, every connected socket is registered here w a _Conn
+        self.sel = selectors.DefaultSelector()
+        # Timer heap run by the event loop: (deadline, seq, fn, args)
+        self._timers: list[tuple] = []
+        self._timer_seq = itertools.count()
+        # Msg type -> handler(msg, conn), shared by inbound & outbound peer conns
+        self._handlers = {
+            "HELLO":            self._on_hello,
+            "GOSSIP":           self._on_gossip,
+            "PING":             self._on_ping,
+            "PONG":             self._on_pong,
+            "SUSPECT_REQUEST":  self._on_suspect_request,
+            "SUSPECT_RESPONSE": self._on_suspect_response,
+            "DEAD_CONFIRMED":   self._on_dead_confirmed_msg,
+        }
+        # Other seed→peer message types can be added here
+        self._seed_handlers = {
+            "DEAD_CONFIRMED":   self._on_dead_confirmed_msg,
+        }
+
+        # ICMP echo socket (None means fall back to the ping command).
+        # Replies are reaped by the event loop into _icmp_alive for this round
+        self._icmp_sock = open_icmp_socket()
+        self._icmp_seq = 0
+        self._icmp_alive: set[str] = set()
+        # Replies come from the resolved IP, not the host string a peer
+        # registered with (e.g. "localhost"). Hosts are resolved once into
+        # _host_ips, _icmp_addrs maps this round's reply IP -> hosts
+        self._host_ips: dict[str, str] = {}
+        self._icmp_addrs: dict[str, tuple] = {}
+        if self._icmp_sock is not None:
+            self.sel.register(self._icmp_sock, selectors.EVENT_READ,
+                              data=_Conn(self._icmp_sock, "icmp"))
 
         self._setup_logger()
         self.log(f"Initialized  quorum={self.quorum}/{self.n_seeds}")
 
     def _load_config(self, path: str):   #Config / Logger
-        if not os.path.exists(path):
+        # plain ip,port lines, blank and # comment lines skipped
+        try:
+            f = open(path)
+        except FileNotFoundError:
             print(f"[ERROR] config.csv not found: {path}")
             sys.exit(1)
-        with open(path, newline="") as f:
-            for row in csv.reader(f):
-                row= [c.strip() for c in row]
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                row = [c.strip() for c in line.split(",")]
                 if len(row) >= 2:
                     self.all_seeds.append((row[0], int(row[1])))
 
@@ -150,12 +339,17 @@ class PeerNode:
         self.logger.setLevel(logging.DEBUG)
         fmt= logging.Formatter("%(asctime)s [PEER %(name)s] %(message)s",
                                 datefmt="%H:%M:%S")
-        fh= logging.FileHandler(f"outputfile_peer_{self.port}.txt", mode="a")
+        fh= logging.FileHandler(f"outputfile_peer_{self.port}.txt", mode="a", delay=True)
         fh.setFormatter(fmt)
-        self.logger.addHandler(fh)
         ch= logging.StreamHandler(sys.stdout)
         ch.setFormatter(fmt)
-        self.logger.addHandler(ch)
+        # log() is just a queue put, formatting & file/stdout writes happen on
+        # the listener thread so they never block the gossip/liveness paths
+        q= queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(q))
+        self.log_listener= logging.handlers.QueueListener(q, fh, ch,
+                                                          respect_handler_level=True)
+        self.log_listener.start()
 
     def log(self, msg: str):
         self.logger.info(msg)
@@ -167,6 +361,7 @@ class PeerNode:
         all_peer_entries = self._register_and_collect(self.quorum)
         if not all_peer_entries[0]:  # registered_seeds list is empty
             self.log("FATAL: could not register with enough seeds. Exiting.")
+            self.log_listener.stop()  # flush queued records before exit
             sys.exit(1)
 
         registered_seeds, peer_entries = all_peer_entries
@@ -189,75 +384,143 @@ class PeerNode:
                 time.sleep(60)
         except KeyboardInterrupt:
             self.log("Shutting down.")
+            self.log_listener.stop()
 
 
     def _start_server(self):  # Server 
         srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR,1)
+        tune_socket(srv)  # inherited by accepted sockets on most platforms
         srv.bind((self.host,self.port))
         srv.listen(100)
         self.log(f"Listening on {self.host}:{self.port}")
-        threading.Thread(target=self._accept_loop, args=(srv,), daemon=True).start()
+        self.sel.register(srv, selectors.EVENT_READ, data=None)
+        threading.Thread(target=self._io_loop, daemon=True).start()
 
-    def _accept_loop(self,srv: socket.socket):
+    # Event loop
+    def _io_loop(self):
+        """Single reader for the listening socket and every peer/seed socket,
+        also completes outbound connects and runs timers."""
         while True:
+            timeout = self._run_due_timers()
+            for key, _ in self.sel.select(timeout=timeout):
+                if key.data is None:
+                    self._accept(key.fileobj)
+                elif key.data.kind == "icmp":
+                    self._on_icmp_readable(key.fileobj)
+                elif key.data.kind == "connecting":
+                    self._on_connect_ready(key.data)
+                else:
+                    self._on_readable(key.data)
+
+    def _call_later(self, delay: float, fn, *args):
+        """Run fn(*args) on the event loop thread after delay secs."""
+        with self._lock:
+            heapq.heappush(self._timers, (time.monotonic() + delay,
+                                          next(self._timer_seq), fn, args))
+
+    def _run_due_timers(self) -> float:
+        """Run expired timers, return the select timeout until the next one."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._timers and self._timers[0][0] <= now:
+                due.append(heapq.heappop(self._timers))
+            wait = self._timers[0][0] - now if self._timers else 0.5
+        for _, _, fn, args in due:
             try:
-                conn, addr = srv.accept()
-                threading.Thread(target=self._handle_inbound,
-                                 args=(conn, addr), daemon=True).start()
-            except Exception:
-                break
+                fn(*args)
+            except Exception as e:
+                self.log(f"Timer {fn.__name__} failed: {e!r}")
+        return min(0.5, max(0.0, wait))
 
-    def _handle_inbound(self, conn: socket.socket, addr):
-        """ 
-        Handle an inbound connection from another peer
-        Peer level suspicion sends SUSPECT_REQUEST to all neighbours except suspect
-        & waits for SUSPECT_RESPONSE, quorum of confirmations triggers DEAD_REPORT
-        """
-        peer_key = None
-        while True:
-            msg = recv_msg(conn)
-            if msg is None:
+    def _accept(self, srv: socket.socket):
+        try:
+            conn, addr = srv.accept()
+        except Exception:
+            return
+        tune_socket(conn)
+        self._register(_Conn(conn, "inbound"))
+
+    def _register(self, c: _Conn):
+        self.sel.register(c.sock, selectors.EVENT_READ, data=c)
+
+    def _unregister(self, sock: socket.socket):
+        try:
+            self.sel.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+
+    def _on_readable(self, c: _Conn):
+        try:
+            chunk = c.sock.recv(self.RECV_SIZE)
+        except Exception:
+            chunk = b""
+        if not chunk:
+            self._on_closed(c)
+            return
+        c.rx += chunk
+        try:
+            msgs = parse_frames(c.rx)
+        except Exception:
+            self._on_closed(c)  # malformed frame, drop the connection
+            return
+        handlers = self._seed_handlers if c.kind == "seed" else self._handlers
+        for msg in msgs:
+            # a bad msg must not take down the loop shared by every socket
+            try:
+                handler = handlers.get(msg.get("type", ""))
+                if handler:
+                    handler(msg, c)
+            except Exception as e:
+                self.log(f"Dropped malformed msg from {c.peer_key}: {e!r}")
+
+    def _on_closed(self, c: _Conn):
+        self._unregister(c.sock)
+        if c.kind == "seed":
+            self.log(f"Seed {c.peer_key} connection closed")
+        elif c.peer_key:
+            if c.kind == "inbound":
                 #Instantly trigger suspicion for dropped inbound connections too!
-                if peer_key:
-                    self.log(f"Lost inbound connection from {peer_key}")
-                    self._start_suspicion(peer_key)
-                break
-            
-            t = msg.get("type", "")
-            if t == "HELLO":
-                peer_key = (msg["ip"], int(msg["port"]))
-                with self.nbr_lock:
-                    self.neighbours[peer_key] = conn
-                with self.mp_lock:
-                    self.missed_pings[peer_key] = 0
-                self.log(f"Inbound HELLO from {peer_key}")
-            elif t == "GOSSIP":
-                self._on_gossip(msg, conn)
-            elif t == "PING":
-                send_msg(conn, {"type": "PONG",
-                                "from_ip": self.host, "from_port": self.port})
-            elif t == "PONG":
-                if peer_key:
-                    with self.mp_lock:
-                        self.missed_pings[peer_key] = 0
-                    with self.pong_lock:
-                        self.pong_received.add(peer_key)
-            elif t == "SUSPECT_REQUEST":
-                self._on_suspect_request(msg, conn)
-            elif t == "SUSPECT_RESPONSE":
-                self._on_suspect_response(msg)
-            elif t == "DEAD_CONFIRMED":
-                self._on_dead_confirmed((msg["dead_ip"], int(msg["dead_port"])))
-                
-        if peer_key:
-            with self.nbr_lock:
-                self.neighbours.pop(peer_key, None)
+                self.log(f"Lost inbound connection from {c.peer_key}")
+            else:
+                self.log(f"Lost connection to neighbour {c.peer_key}")
+            self._start_suspicion(c.peer_key)
+            with self._lock:
+                st = self.peers.get(c.peer_key)
+                if st and st.sock is c.sock:
+                    st.sock = None  # state stays until the suspicion resolves
         try:
-            conn.close()
+            c.sock.close()
         except Exception:
             pass
-        
+
+    # Msg handlers, all called as handler(msg, conn) from the event loop
+    def _on_hello(self, msg: dict, c: _Conn):
+        if c.kind != "inbound":
+            return
+        c.peer_key = (msg["ip"], int(msg["port"]))
+        self._add_neighbour(c.peer_key, c.sock)
+        self.log(f"Inbound HELLO from {c.peer_key}")
+
+    def _on_ping(self, msg: dict, c: _Conn):
+        send_frame(c.sock, self._pong_frame)
+
+    def _on_pong(self, msg: dict, c: _Conn):
+        # read-modify-write of fields the liveness thread also resets
+        with self._lock:
+            st = self.peers.get(c.peer_key) if c.peer_key else None
+            if not st:
+                return
+            st.missed = 0
+            if not st.ponged:
+                st.ponged = True
+                self._pongs_in += 1
+        self._check_round_done()
+
+    def _on_dead_confirmed_msg(self, msg: dict, c: _Conn):
+        self._on_dead_confirmed((msg["dead_ip"], int(msg["dead_port"])))
+
     # Seed registration (serial, no races) 
     def _register_and_collect(self, need: int):
         """
@@ -305,33 +568,21 @@ class PeerNode:
                     peer_map[key] = max(peer_map.get(key, 0), p.get("degree", 0))
 
             registered.append((sip, sport))
-            with self.seed_lock:
+            with self._lock:
                 self.seed_socks[(sip, sport)] = sock
-            # NOW hand off to bg listener(no more synch reads on sock)
-            threading.Thread(target=self._listen_seed,
-                             args=(sock, (sip, sport)), daemon=True).start()
+            # NOW hand off to the event loop (no more synch reads on sock)
+            self._register(_Conn(sock, "seed", (sip, sport)))
 
         self.log(f"Registered with {len(registered)}/{self.quorum} required seeds")
         entries = [{"ip": ip, "port": port, "degree": deg}
                    for (ip, port), deg in peer_map.items()]
         return registered,entries
 
-    def _listen_seed(self, sock: socket.socket, seed_key: tuple):
-        """Bg reader for a seed socket (DEAD_CONFIRMED etc.)"""
-        while True:
-            msg= recv_msg(sock)
-            if msg is None:
-                self.log(f"Seed {seed_key} connection closed")
-                break
-            t= msg.get("type", "")
-            if t == "DEAD_CONFIRMED":
-                self._on_dead_confirmed((msg["dead_ip"], int(msg["dead_port"])))
-            # Other seed→peer message types can be added here
-
     def _tcp_connect(self, ip: str, port: int, retries: int = 4):
         for i in range(retries):
             try:
                 s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                tune_socket(s)
                 s.settimeout(5)
                 s.connect((ip, port))
                 s.settimeout(None)
@@ -349,212 +600,309 @@ class PeerNode:
         k = min(n, max(1, int(random.paretovariate(2.5))))
 
         # Weights ∝ deg+1  (preferential attachment)
-        weights = [p.get("degree", 0) + 1.0 for p in peer_list]
-        total = sum(weights)
-        probs = [w / total for w in weights]
-
-        chosen = []
-        remaining_idx = list(range(n))
-        rem_probs = list(probs)
-
-        for _ in range(k):
-            if not remaining_idx:
-                break
-            r= random.random()
-            cum= 0.0
-            picked = len(remaining_idx) - 1  # fallback: last
-            for i,prob in enumerate(rem_probs):
-                cum +=prob
-                if r <= cum:
-                    picked = i
-                    break
-            orig= remaining_idx[picked]
-            chosen.append((peer_list[orig]["ip"], int(peer_list[orig]["port"])))
-            remaining_idx.pop(picked)
-            rem_probs.pop(picked)
-            s= sum(rem_probs) or 1.0
-            rem_probs = [p / s for p in rem_probs]
-
-        return chosen
+        # Weighted sampling without replacement in one pass (Efraimidis-Spirakis):
+        # each peer gets key u^(1/w), the k largest keys are the sample
+        keyed = ((random.random() ** (1.0 / (p.get("degree", 0) + 1.0)), i)
+                 for i, p in enumerate(peer_list))
+        chosen = heapq.nlargest(k, keyed)
+        return [(peer_list[i]["ip"], int(peer_list[i]["port"])) for _, i in chosen]
 
     # Outbound peer conn
     def _connect_to_neighbours(self, neighbours: list[tuple]):
+        """Start every connect at once, non-blocking, they complete in the event loop."""
         for (nip, nport) in neighbours:
             if (nip, nport) == (self.host,self.port):
                 continue
-            threading.Thread(target=self._connect_one_neighbour,
-                             args=(nip, nport), daemon=True).start()
+            self._call_later(0, self._start_connect, (nip, nport), 0)
+
+    def _start_connect(self, peer_key: tuple, attempt: int):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        tune_socket(s)
+        s.setblocking(False)
+        c = _Conn(s, "connecting", peer_key, attempt)
+        try:
+            s.connect_ex(peer_key)  # EINPROGRESS, done when writable
+            self.sel.register(s, selectors.EVENT_WRITE, data=c)
+        except Exception:
+            self._connect_failed(c)
+            return
+        self._call_later(self.CONNECT_TIMEOUT, self._connect_timeout, c)
 
-    def _connect_one_neighbour(self, nip: str, nport: int):
-        sock = self._tcp_connect(nip, nport, retries=5)
-        if sock is None:
-            self.log(f"Could not connect to neighbour {nip}:{nport}")
+    def _on_connect_ready(self, c: _Conn):
+        """Writable means the connect finished, SO_ERROR says how."""
+        if c.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+            self._connect_failed(c)
             return
-        send_msg(sock, {"type": "HELLO", "ip": self.host, "port": self.port})
-        peer_key = (nip, nport)
-        with self.nbr_lock:
-            self.neighbours[peer_key] = sock
-        with self.mp_lock:
-            self.missed_pings[peer_key] = 0
-        self.log(f"Connected to neighbour {nip}:{nport}")
-        self._listen_neighbour(sock, peer_key)
-
-    def _listen_neighbour(self, sock: socket.socket, peer_key: tuple):
-        """Outbound neighbour receive loop """
-        while True:
-            msg = recv_msg(sock)
-            if msg is None:
-                self.log(f"Lost connection to neighbour {peer_key}")
-                
-                self._start_suspicion(peer_key)
-                
-                with self.nbr_lock:
-                    self.neighbours.pop(peer_key, None)
-                break
-            
-            t = msg.get("type", "")
-            if t == "GOSSIP":
-                self._on_gossip(msg, sock)
-            elif t == "PING":
-                send_msg(sock, {"type": "PONG",
-                                "from_ip": self.host, "from_port": self.port})
-            elif t == "PONG":
-                with self.mp_lock:
-                    self.missed_pings[peer_key] = 0
-                with self.pong_lock:
-                    self.pong_received.add(peer_key)
-            elif t == "SUSPECT_REQUEST":
-                self._on_suspect_request(msg, sock)
-            elif t == "SUSPECT_RESPONSE":
-                self._on_suspect_response(msg)
-            elif t == "DEAD_CONFIRMED":
-                self._on_dead_confirmed((msg["dead_ip"], int(msg["dead_port"])))
+        self._unregister(c.sock)
+        c.sock.setblocking(True)
+        c.kind = "neighbour"
+        peer_key = c.peer_key
+        send_frame(c.sock, self._hello_frame)
+        self._add_neighbour(peer_key, c.sock)
+        self.log(f"Connected to neighbour {peer_key[0]}:{peer_key[1]}")
+        self._register(c)
+
+    def _add_neighbour(self, peer_key: tuple, sock: socket.socket):
+        with self._lock:
+            st = self.peers.get(peer_key)
+            if st is None:
+                st = self.peers[peer_key] = PeerState()
+            st.sock = sock
+            st.missed = 0
+
+    def _neighbour_socks(self) -> tuple:
+        """Snapshot of (peer_key, sock) for every connected neighbour."""
+        with self._lock:
+            return tuple((k, st.sock) for k, st in self.peers.items()
+                         if st.sock is not None)
+
+    def _connect_timeout(self, c: _Conn):
+        if c.kind == "connecting":
+            self._connect_failed(c)
+
+    def _connect_failed(self, c: _Conn):
+        c.kind = "failed"  # the pending timeout for this attempt becomes a no-op
+        self._unregister(c.sock)
+        try:
+            c.sock.close()
+        except Exception:
+            pass
+        nxt = c.attempt + 1
+        if nxt >= self.CONNECT_RETRIES:
+            self.log(f"Could not connect to neighbour {c.peer_key[0]}:{c.peer_key[1]}")
+            return
+        self._call_later(nxt, self._start_connect, c.peer_key, nxt)  # same backoff as before
 
     # Gossip
     def _gossip_loop(self):
         """Generate one gossip message every 5 s, up to MAX_GOSSIP."""
         time.sleep(2)  # allow neighbour connections to stabilise
+        next_at = time.monotonic()
         while True:
-            with self.gc_lock:
+            with self._lock:
                 if self.gossip_count >= self.MAX_GOSSIP:
                     break
                 self.gossip_count += 1
                 seq = self.gossip_count
 
-            ts = time.time()
-            content = f"{ts:.6f}:{self.host}:{seq}"
-            h = hashlib.sha256(content.encode()).hexdigest()
+            # wall clock: the timestamp is part of the gossip msg format
+            content = f"{time.time():.6f}:{self.host}:{seq}"
+            h = gossip_digest(content)
 
             self.log(f"Generated gossip #{seq}: {content}")
-            with self.ml_lock:
-                self.ml.add(h)
+            with self._lock:
+                self._ml_add(h)
 
             self._broadcast({"type": "GOSSIP", "content": content,
-                             "hash": h, "origin_ip": self.host,
+                             "hash": h.hex(), "origin_ip": self.host,
                              "origin_port": self.port}, exclude=None)
-            time.sleep(self.GOSSIP_INTERVAL)
+            next_at += self.GOSSIP_INTERVAL
+            self._sleep_until(next_at)
 
-    def _on_gossip(self, msg: dict, sender_sock: socket.socket):
-        h = msg.get("hash") or hashlib.sha256(
-            msg.get("content", "").encode()).hexdigest()
+    def _on_gossip(self, msg: dict, c: _Conn):
+        content = msg.get("content", "")
+        # Sender's hash is only a fast dedup key, recompute once on first sight
+        try:
+            h = bytes.fromhex(msg.get("hash", ""))
+        except (TypeError, ValueError):
+            h = b""
+        if h in self.ml:
+            return  # duplicate or drop
+
+        digest = gossip_digest(content)
+        if h and h != digest:
+            self.log(f"GOSSIP dropped, hash mismatch for '{content}'")
+            return
+        with self._lock:
+            if digest in self.ml:
+                return
+            self._ml_add(digest)
 
-        with self.ml_lock:
-            if h in self.ml:
-                return  # duplicate or drop
-            self.ml.add(h)
+        if self.logger.isEnabledFor(logging.INFO):
+            origin = f"{msg.get('origin_ip')}:{msg.get('origin_port')}"
+            self.log(f"GOSSIP (first time): '{content}'  from {origin}  ts={time.time():.3f}")
 
-        content = msg.get("content", "")
-        origin = f"{msg.get('origin_ip')}:{msg.get('origin_port')}"
-        self.log(f"GOSSIP (first time): '{content}'  from {origin}  ts={time.time():.3f}")
+        # Fwd to all neighbours except the sender. msg is ours alone (decoded
+        # for this call only) so restamp it in place instead of copying
+        msg["sender_ip"] = self.host
+        msg["sender_port"] = self.port
+        self._broadcast(msg, exclude=c.sock)
 
-        # Fwd to all neighbours except the sender
-        fwd = dict(msg)
-        fwd["sender_ip"] = self.host
-        fwd["sender_port"] = self.port
-        self._broadcast(fwd, exclude=sender_sock)
+    def _ml_add(self, digest: bytes):
+        """Insert into the bounded ML. Caller holds _lock."""
+        if len(self.ml_ring) >= self.ML_CAPACITY:
+            self.ml.discard(self.ml_ring.popleft())
+        self.ml_ring.append(digest)
+        self.ml.add(digest)
 
     def _broadcast(self, msg: dict, exclude: socket.socket | None):
-        with self.nbr_lock:
-            targets = list(self.neighbours.values())
-        for s in targets:
+        frame = encode_frame(msg)  # once, not once per neighbour
+        for _, s in self._neighbour_socks():
             if s is not exclude:
-                send_msg(s, msg)
+                send_frame(s, frame)
 
     # Liveness/Ping 
     def _liveness_loop(self):
         time.sleep(5)   # let gossip start first
         while True:
-            # Clear pong_received set at start of round
-            with self.pong_lock:
-                self.pong_received.clear()
-
-            with self.nbr_lock:
-                targets = list(self.neighbours.keys())
-
-            for peer_key in targets:
-                # TCP PING
-                with self.nbr_lock:
-                    sock = self.neighbours.get(peer_key)
-                if sock:
-                    ok = send_msg(sock, {"type": "PING",
-                                         "from_ip": self.host,
-                                         "from_port": self.port})
-                    if not ok:
-                        self._miss(peer_key)
-
-                # System ICMP ping (extra check)
-                icmp_ok = system_ping(peer_key[0])
-                if not icmp_ok:
+            round_start = time.monotonic()
+            # Clear PONG flags at start of round, one (key, sock) snapshot for
+            # the whole round. A neighbour removed mid round just fails its
+            # PING, which already counts as a miss.
+            with self._lock:
+                for st in self.peers.values():
+                    st.ponged = False
+                self._pongs_in = 0
+                snap = tuple((k, st.sock) for k, st in self.peers.items()
+                             if st.sock is not None)
+            hosts = {k[0] for k, _ in snap}
+            addrs = self._icmp_targets(hosts)  # may resolve, keep it unlocked
+            # expectations are set before anything is sent, replies may be quick.
+            # New seq & reply map go in before _icmp_alive is cleared, so a
+            # straggler reply from the last round can't count for this one
+            with self._lock:
+                self._icmp_seq = (self._icmp_seq + 1) & 0xFFFF
+                self._icmp_addrs = addrs
+                self._icmp_alive = set()
+                self._round_pongs = len(snap)
+                self._round_hosts = len(hosts) if self._icmp_sock is not None else 0
+                self._round_done = threading.Event()
+
+            # TCP PING, prebuilt frame identical for every neighbour
+            for peer_key, sock in snap:
+                if not send_frame(sock, self._ping_frame):
                     self._miss(peer_key)
 
-            # Wait for PONGs (half the ping interval)
-            time.sleep(self.PING_INTERVAL // 2)
+            # ICMP ping (extra check), one echo per distinct host
+            self._start_icmp_round(hosts, addrs)
 
-            # Check which neighbours did NOT pong back
-            with self.nbr_lock:
-                still_alive = list(self.neighbours.keys())
-            with self.pong_lock:
-                ponged = set(self.pong_received)
+            # Wait for PONGs and ICMP replies, at most half the ping interval
+            self._check_round_done()
+            self._round_done.wait(max(0.0, round_start + self.PING_INTERVAL / 2
+                                      - time.monotonic()))
 
-            for peer_key in still_alive:
-                if peer_key not in ponged:
+            reachable = set(self._icmp_alive)
+            for peer_key, _ in snap:
+                if peer_key[0] not in reachable:
                     self._miss(peer_key)
-                
-                else: # reset counter
-                    with self.mp_lock:
-                        self.missed_pings[peer_key] =0
 
-            time.sleep(self.PING_INTERVAL // 2)
+            # Check which neighbours did NOT pong back
+            with self._lock:
+                silent = []
+                for peer_key, st in self.peers.items():
+                    if st.sock is None:
+                        continue
+                    if st.ponged:
+                        st.missed = 0  # reset counter
+                    else:
+                        silent.append(peer_key)
+            for peer_key in silent:
+                self._miss(peer_key)
+
+            # Fixed round length however long the sends / fallback pings took
+            self._sleep_until(round_start + self.PING_INTERVAL)
+
+    @staticmethod
+    def _sleep_until(deadline: float):
+        time.sleep(max(0.0, deadline - time.monotonic()))
+
+    def _icmp_targets(self, hosts: set) -> dict:
+        """Reply IP -> hosts behind it, for matching this round's echo replies"""
+        addrs: dict[str, tuple] = {}
+        if self._icmp_sock is not None:
+            for host in hosts:
+                ip = self._resolve(host)
+                if ip is not None:
+                    addrs[ip] = addrs.get(ip, ()) + (host,)
+        return addrs
+
+    def _start_icmp_round(self, hosts: set, addrs: dict):
+        """Fire one echo request per distinct IP. Over the ICMP socket this
+        returns at once and the event loop collects replies while we wait for
+        PONGs; the ping command fallback blocks here."""
+        if not hosts:
+            return
+        if self._icmp_sock is None:
+            self._icmp_alive = system_ping_all(hosts)
+            return
+        pkt = icmp_echo_request(self._icmp_seq)
+        for ip in addrs:
+            try:
+                self._icmp_sock.sendto(pkt, (ip, 0))
+            except OSError:
+                pass
+
+    def _resolve(self, host: str):
+        """host -> IPv4 string, cached. None (retried next round) if lookup fails"""
+        ip = self._host_ips.get(host)
+        if ip is None:
+            try:
+                ip = self._host_ips[host] = socket.gethostbyname(host)
+            except OSError:
+                return None
+        return ip
+
+    def _on_icmp_readable(self, sock: socket.socket):
+        try:
+            data, addr = sock.recvfrom(1024)
+        except OSError:
+            return
+        # seq check & credit under the lock, atomic w.r.t. a round starting
+        with self._lock:
+            if icmp_reply_seq(data) != self._icmp_seq:
+                return  # straggler from an earlier round
+            self._icmp_alive.update(self._icmp_addrs.get(addr[0], ()))
+        self._check_round_done()
+
+    def _check_round_done(self):
+        if (self._pongs_in >= self._round_pongs
+                and len(self._icmp_alive) >= self._round_hosts):
+            self._round_done.set()
 
     def _miss(self, peer_key: tuple):
-        with self.mp_lock:
-            self.missed_pings[peer_key] = self.missed_pings.get(peer_key, 0) + 1
-            count = self.missed_pings[peer_key]
+        with self._lock:
+            st = self.peers.get(peer_key)
+            if st is None:
+                return  # already removed
+            st.missed += 1
+            count = st.missed
         if count >= self.PING_MISS_THRESH:
             self._start_suspicion(peer_key)
 
     #Suspicion / Dead node
     def _start_suspicion(self, suspect: tuple):
-        with self.susp_lock:
-            if suspect in self.suspected:
+        """
+        Peer level suspicion sends SUSPECT_REQUEST to all neighbours except suspect
+        & waits for SUSPECT_RESPONSE, quorum of confirmations triggers DEAD_REPORT
+        """
+        with self._lock:
+            st = self.peers.get(suspect)
+            if st is None:
+                st = self.peers[suspect] = PeerState()
+            if st.suspicion is not None:
                 return
-            self.suspected[suspect] = {"confirmations": {self.id}, "reported": False}
+            st.suspicion = {"confirmations": {self.id}, "reported": False}
         self.log(f"SUSPICION started for {suspect}")
 
         req = {"type": "SUSPECT_REQUEST",
                "suspect_ip": suspect[0], "suspect_port": suspect[1],
                "requester_ip": self.host, "requester_port": self.port}
 
-        with self.nbr_lock:
-            peers = [(k, s) for k, s in self.neighbours.items() if k != suspect]
-
-        for _, sock in peers:
-            send_msg(sock, req)
+        frame = encode_frame(req)
+        for k, sock in self._neighbour_socks():
+            if k != suspect:
+                send_frame(sock, frame)
 
         threading.Thread(target=self._suspicion_timeout,
                          args=(suspect,), daemon=True).start()
 
-    def _on_suspect_request(self, msg: dict, conn: socket.socket):
+    def _on_suspect_request(self, msg: dict, c: _Conn):
+        """Probe the suspect ourselves and answer with a SUSPECT_RESPONSE"""
+        # port-knock blocks up to 1 s, keep it off the event loop
+        threading.Thread(target=self._probe_suspect,
+                         args=(msg, c.sock), daemon=True).start()
+
+    def _probe_suspect(self, msg: dict, conn: socket.socket):
         suspect = (msg["suspect_ip"], int(msg["suspect_port"]))
         
         # ICMP ping fails for localhost testing. Use a fast TCP port-knock instead.
@@ -574,13 +922,13 @@ class PeerNode:
                         "alive": alive,
                         "responder_ip": self.host, "responder_port": self.port})
 
-    def _on_suspect_response(self, msg: dict):
+    def _on_suspect_response(self, msg: dict, c: _Conn):
         suspect = (msg["suspect_ip"], int(msg["suspect_port"]))
         alive = msg.get("alive", True)
         responder = f"{msg['responder_ip']}:{msg['responder_port']}"
 
-        with self.susp_lock:
-            entry = self.suspected.get(suspect)
+        with self._lock:
+            entry = self._suspicion(suspect)
             if not entry or entry["reported"]:
                 return
             if not alive:
@@ -589,25 +937,30 @@ class PeerNode:
 
         self.log(f"SUSPECT_RESPONSE from {responder} for {suspect}: alive={alive} confirms={cnt}")
 
-        with self.nbr_lock:
-            total = len(self.neighbours)
+        total = len(self._neighbour_socks())
         peer_quorum = max(1, (total // 2) + 1)
 
         if cnt >= peer_quorum:
-            with self.susp_lock:
-                entry = self.suspected.get(suspect)
+            with self._lock:
+                entry = self._suspicion(suspect)
                 if not entry or entry["reported"]:
                     return
                 entry["reported"] = True
             self._report_dead(suspect)
 
+    def _suspicion(self, suspect: tuple):
+        st = self.peers.get(suspect)
+        return st.suspicion if st else None
+
     def _suspicion_timeout(self, suspect: tuple):
         time.sleep(self.SUSPECT_TIMEOUT)
-        with self.susp_lock:
-            entry = self.suspected.get(suspect)
-            if entry and not entry["reported"]:
+        with self._lock:
+            st = self.peers.get(suspect)
+            if st and st.suspicion and not st.suspicion["reported"]:
                 self.log(f"Suspicion TIMEOUT for {suspect} — no peer quorum, cancelling")
-                del self.suspected[suspect]
+                st.suspicion = None
+                if st.sock is None:  # not reconnected meanwhile, forget it
+                    del self.peers[suspect]
 
     def _report_dead(self, dead: tuple):
         dead_ip, dead_port = dead
@@ -616,24 +969,21 @@ class PeerNode:
         msg = {"type": "DEAD_REPORT",
                "dead_ip": dead_ip, "dead_port": dead_port,
                "timestamp": ts, "reporter": self.id}
-        with self.seed_lock:
+        with self._lock:
             seeds = list(self.seed_socks.values())
         for s in seeds:
             send_msg(s, msg)
 
     def _on_dead_confirmed(self, dead_key: tuple):
         self.log(f"DEAD_CONFIRMED for {dead_key} — removing from neighbours")
-        with self.nbr_lock:
-            sock = self.neighbours.pop(dead_key, None)
-        if sock:
+        with self._lock:
+            st = self.peers.pop(dead_key, None)
+        if st and st.sock:
+            self._unregister(st.sock)
             try:
-                sock.close()
+                st.sock.close()
             except Exception:
                 pass
-        with self.susp_lock:
-            self.suspected.pop(dead_key, None)
-        with self.mp_lock:
-            self.missed_pings.pop(dead_key, None)
 
 
 # Entry point
@@ -31,8 +31,8 @@ print("Waiting for Seeds to establish consensus...")
 time.sleep(5)
 
 print("Starting Peers...")
+# Peers register with the seeds independently, launch them all at once
 for ip, port in PEERS:
     run_in_new_terminal(f"{PYTHON_EXE} peer.py {ip} {port}")
-    time.sleep(1)
 
 print("Network is running. Check the newly opened windows!")
\ No newline at end of file
@@ -2,291 +2,454 @@
  Seed Node for Gossip based P2P Network
 
 Each seed dials every other seed whose port > its own
-(so each pair has exactly 1 conn. : lower port seed dials 
+(so each pair has exactly 1 conn. : lower port seed dials
 higher port one)
 
 The dialling seed:
   1. Sends SEED_HELLO to identify itself
-  2. Stores the outbound socket in seed_channels
-  3. Reads from that socket in a loop (_route_msg)
+  2. Stores the outbound writer in seed_channels
+  3. Reads from that connection in a loop (_route_msg)
 
 The accepting seed:
   1. Receives SEED_HELLO in _handle_conn
-  2. Stores the accepted socket in seed_channels
+  2. Stores the accepted writer in seed_channels
   3. Reads from it in the _handle_connection loop (_route_message)
 
-So every seed2seed socket is read by BOTH ends.Sending a proposal on
+So every seed2seed connection is read by BOTH ends.Sending a proposal on
 seed_channels[X] writes into X's reader loop and X's reply comes back on
-the same socket to the proposer's reader loop.
+the same connection to the proposer's reader loop.
+
+All connections and timeouts run on one asyncio event loop, so handlers
+run one at a time and the shared state below needs no locks.
 
 Protocol: 4 byte big endian length + JSON payload.
 """
 
 import sys
-import os
-import csv
 import json
+import asyncio
 import socket
 import struct
-import threading
 import time
+import random
 import logging
+import logging.handlers
+import queue
+from dataclasses import dataclass
 
 # Framing helpers
 HEADER_SIZE = 4
+_HDR = struct.Struct(">I")
+# Compact separators: no whitespace on the wire, same JSON payloads
+_ENC = json.JSONEncoder(separators=(",", ":"))
+
+# orjson is used when installed (bytes straight in/out, same JSON on the
+# wire so peers are unaffected), stdlib json otherwise
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data: dict) -> bytes:
+        return _ENC.encode(data).encode("utf-8")
+    _loads = json.loads  # bytes in, detects utf-8 itself
+
+# uvloop (libuv) event loop when installed, the default asyncio loop otherwise
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def run_loop(main):
+    """Run the coroutine to completion on a uvloop loop if available. Uses a
+    loop factory, the policy API is deprecated from Python 3.14"""
+    if uvloop is None:
+        return asyncio.run(main)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    # 3.10 has no Runner, the policy API is not deprecated there
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)
+
+def encode_frame(data: dict) -> bytes:
+    """Header + payload bytes, build once when the same msg goes to many writers"""
+    payload = _dumps(data)
+    return _HDR.pack(len(payload)) + payload
+
+
+def send_frame(writer: asyncio.StreamWriter, frame: bytes) -> bool:
+    """Queue an encoded frame on the transport"""
+    try:
+        if writer.is_closing():
+            return False
+        writer.write(frame)
+        return True
+    except Exception:
+        return False
+
 
-def send_msg(sock: socket.socket, data: dict) -> bool:
-    """Serialize data to JSON, prefix with 4 byte len send atomically"""
+def send_msg(writer: asyncio.StreamWriter, data: dict) -> bool:
+    """Serialize data to JSON, prefix with 4 byte len, queue on the transport.
+    Header and payload go in as separate buffers, no concat copy (the
+    transport sends them with one sendmsg where the loop supports it)"""
     try:
-        payload = json.dumps(data).encode("utf-8")
-        sock.sendall(struct.pack(">I", len(payload)) + payload)
+        if writer.is_closing():
+            return False
+        payload = _dumps(data)
+        writer.writelines((_HDR.pack(len(payload)), payload))
         return True
     except Exception:
         return False
 
 
-def recv_msg(sock: socket.socket):
-    """Receive 1 len prefixed JSON msg. Returns None on error/close"""
+async def recv_msg(reader: asyncio.StreamReader):
+    """Receive 1 len prefixed JSON msg. Returns None on error/close.
+    The StreamReader already keeps one receive bytearray per connection,
+    reused across messages; readexactly only slices the frame out of it"""
     try:
-        hdr = _recv_exact(sock, HEADER_SIZE)
-        if not hdr:
-            return None
-        n= struct.unpack(">I", hdr)[0]
-        body= _recv_exact(sock, n)
-        if not body:
-            return None
-        return json.loads(body.decode("utf-8"))
+        hdr = await reader.readexactly(HEADER_SIZE)
+        n= _HDR.unpack(hdr)[0]
+        body= await reader.readexactly(n)
+        return _loads(body)
     except Exception:
         return None
 
 
-def _recv_exact(sock: socket.socket, n: int):
-    buf = b""
-    while len(buf) < n:
-        chunk = sock.recv(n - len(buf))
-        if not chunk:
-            return None
-        buf += chunk
-    return buf
+# Socket tuning: proposals and votes are tiny, send them at once instead of
+# letting Nagle hold them back, and let the kernel probe idle seed links
+def tune_socket(writer: asyncio.StreamWriter):
+    sock = writer.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_QUICKACK"):  # Linux only, no delayed ACK on votes
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except OSError:
+        pass
+
+
+def _close(writer: asyncio.StreamWriter):
+    try:
+        writer.close()
+    except Exception:
+        pass
+
+# One peer list entry, slotted: no per peer dict
+@dataclass(slots=True)
+class PeerEntry:
+    degree: int = 0
+    registered_at: int = 0      # time.time_ns()
+
 
 # SeedNode is consensus based peer registration & dead node removal
 class SeedNode:
     """
-    peer_list       : dict[(ip,port)] -> {degree, registered_at}
-    pending_reg     : dict[req_id]    -> {peer, votes, conn, decided}
+    peer_list       : dict[(ip,port)] -> PeerEntry(degree, registered_at)
+    pending_reg     : dict[req_id]    -> {peer, votes, yes, no, conn, decided}
     dead_reports    : dict[(ip,port)] -> set of reporter strings
-    pending_rem     : dict[req_id]    -> {peer, votes, decided}
-    seed_channels   : dict[seed_id]   -> socket  (one per peer seed)
+    pending_rem     : dict[req_id]    -> {peer, votes, yes, no, decided}
+    seed_channels   : dict[seed_id]   -> StreamWriter  (one per peer seed)
     """
 
+    REG_TIMEOUT = 10
+    REM_TIMEOUT = 10
+    REDIAL_MAX = 30      # cap on the seed redial backoff, secs
+
     def __init__(self, host: str, port: int, config_path: str = "config.csv"):
         self.host =host
         self.port =port
-        self.id   = f"{host}:{port}"
+        self.id   = sys.intern(f"{host}:{port}")
 
         self.all_seeds: list = []
         self._load_config(config_path)
         self.n_seeds = len(self.all_seeds)
         self.quorum  = (self.n_seeds // 2) + 1
 
-        # Peer membership
+        # Peer membership, keyed (ip, port) with ip sys.intern'ed at message
+        # ingress so lookups hit on identity before comparing contents.
+        # _pl_cache is its wire form, rebuilt by _pl_changed on add/remove
+        # instead of on every peer list request
         self.peer_list: dict = {}
-        self.pl_lock = threading.Lock()
+        self._pl_cache: list = []
 
         # Consensus is registration
         self.pending_reg: dict = {}
-        self.pr_lock = threading.Lock()
 
         # Dead node buffering
         self.dead_reports: dict = {}
-        self.dr_lock = threading.Lock()
 
         # Consensus  removal
         self.pending_rem: dict = {}
-        self.prem_lock = threading.Lock()
 
-        # Seed2seed channels (both accepted & dialled sockets stored here)
+        # Seed2seed channels (both accepted & dialled writers stored here).
+        # Broadcasts go through a per channel outbound queue drained by one
+        # _link_writer task, _links[seed_id] = (queue, task).
+        # Copy on write: mutations (connect/disconnect, rare) swap in a new
+        # dict and queue tuple, so every broadcast iterates _seed_queues
+        # as is without copying
         self.seed_channels: dict = {}
-        self.sc_lock = threading.Lock()
+        self._links: dict = {}
+        self._seed_queues: tuple = ()
+
+        # Event loop, set in _main. Background tasks are kept referenced
+        # here so they are not garbage collected while running
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set = set()
+
+        # SEED_HELLO depends only on our id, identical for every dial
+        self._hello_frame = encode_frame({"type": "SEED_HELLO", "seed_id": self.id})
+
+        # Msg type -> handler(msg, conn), shared by peer & seed connections
+        self._handlers = {
+            "REGISTER_REQUEST":  self._on_register_request,
+            "REGISTER_PROPOSAL": self._on_register_proposal,
+            "REGISTER_VOTE":     self._on_register_vote,
+            "PEER_LIST_REQUEST": self._on_peer_list_request,
+            "DEAD_REPORT":       self._on_dead_report,
+            "DEAD_PROPOSAL":     self._on_dead_proposal,
+            "DEAD_VOTE":         self._on_dead_vote,
+            "DEAD_CONFIRMED":    self._on_dead_confirmed,
+        }
 
         self._setup_logger()
         self.log(f"Initialized  n_seeds={self.n_seeds}  quorum={self.quorum}")
 
-    # Config 
+    # Config
 
     def _load_config(self, path: str):
-        if not os.path.exists(path):
+        # plain ip,port lines, blank and # comment lines skipped
+        try:
+            f = open(path)
+        except FileNotFoundError:
             print(f"[ERROR] config.csv not found: {path}")
             sys.exit(1)
-        with open(path, newline="") as f:
-            for row in csv.reader(f):
-                row = [c.strip() for c in row]
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                row = [c.strip() for c in line.split(",")]
                 if len(row) >= 2:
                     self.all_seeds.append((row[0], int(row[1])))
 
-    # Logger 
+    # Logger
     def _setup_logger(self):
         self.logger = logging.getLogger(f"seed_{self.port}")
         self.logger.setLevel(logging.DEBUG)
         fmt = logging.Formatter("%(asctime)s [SEED %(name)s] %(message)s",
                                 datefmt="%H:%M:%S")
-        fh = logging.FileHandler(f"outputfile_seed_{self.port}.txt", mode="a")
+        fh = logging.FileHandler(f"outputfile_seed_{self.port}.txt", mode="a", delay=True)
         fh.setFormatter(fmt)
-        self.logger.addHandler(fh)
         ch = logging.StreamHandler(sys.stdout)
         ch.setFormatter(fmt)
-        self.logger.addHandler(ch)
+        # log() is just a queue put, formatting & file/stdout writes happen on
+        # the listener thread so they never stall the event loop
+        q = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(q))
+        self.log_listener = logging.handlers.QueueListener(q, fh, ch,
+                                                           respect_handler_level=True)
+        self.log_listener.start()
+        # Level is fixed after setup, check it once rather than per call
+        self._log_enabled = self.logger.isEnabledFor(logging.INFO)
 
     def log(self, msg: str):
-        self.logger.info(msg)
+        if self._log_enabled:
+            self.logger.info(msg)
 
     # Startup
     def start(self):
-        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        srv.bind((self.host, self.port))
-        srv.listen(100)
+        try:
+            run_loop(self._main())
+        except KeyboardInterrupt:
+            self.log("Shutting down.")
+        finally:
+            self.log_listener.stop()  # flush queued records before exit
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        srv = await asyncio.start_server(self._handle_connection,
+                                         self.host, self.port,
+                                         reuse_address=True, backlog=100)
         self.log(f"Listening on {self.host}:{self.port}")
 
-        threading.Thread(target=self._accept_loop, args=(srv,),daemon=True).start()
         # Wait for all seeds to start listening then dial higher port seeds
-        time.sleep(2)
+        await asyncio.sleep(2)
         self._dial_higher_port_seeds()
 
-        try:
-            while True:
-                time.sleep(60)
-        except KeyboardInterrupt:
-            self.log("Shutting down.")
-            srv.close()
+        async with srv:
+            await srv.serve_forever()
 
-    # Accept loop 
-    def _accept_loop(self, srv: socket.socket):
-        while True:
-            try:
-                conn, addr = srv.accept()
-                threading.Thread(target=self._handle_connection,
-                                 args=(conn,), daemon=True).start()
-            except Exception:
-                break
+    def _spawn(self, coro):
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
 
     #Dial peer seeds (lower port accepts, higher port is dialled)
     def _dial_higher_port_seeds(self):
         """Dial only seeds with port > self.port (avoids duplicate pairs)."""
         for (ip, port) in self.all_seeds:
             if port > self.port:
-                threading.Thread(target=self._dial_one_seed,
-                                 args=(ip, port), daemon=True).start()
-
-    def _dial_one_seed(self, ip: str, port: int):
-        """Connect to a peer seed, register the socket, and read from it."""
-        peer_id = f"{ip}:{port}"
-        for attempt in range(15):
+                self._spawn(self._maintain_link(ip, port))
+
+    async def _maintain_link(self, ip: str, port: int):
+        """Connect to a peer seed, register the writer, and read from it.
+        Redials forever with jittered exponential backoff so the seed mesh
+        heals however long a seed is down."""
+        peer_id = sys.intern(f"{ip}:{port}")
+        attempt = 0
+        while True:
             try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.settimeout(5)
-                s.connect((ip, port))
-                s.settimeout(None)
-                # Identify ourselves
-                send_msg(s, {"type": "SEED_HELLO", "seed_id": self.id})
-                with self.sc_lock:
-                    self.seed_channels[peer_id] = s
-                self.log(f"Dialled seed {ip}:{port}")
-                # Read loop is receive proposals/votes sent back to us
-                while True:
-                    msg = recv_msg(s)
-                    if msg is None:
-                        break
-                    self._route_message(msg, s)
-                # Disconnected
-                with self.sc_lock:
-                    if self.seed_channels.get(peer_id) is s:
-                        del self.seed_channels[peer_id]
-                self.log(f"Lost connection to seed {ip}:{port} — will retry")
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(ip, port), timeout=5)
             except Exception:
-                pass
-            time.sleep(3 + attempt)
-
-    # Connection handler 
-    def _handle_connection(self, conn: socket.socket):
+                writer = None  # seed not up (yet), back off below
+            if writer is not None:
+                try:
+                    tune_socket(writer)
+                    # Identify ourselves
+                    send_frame(writer, self._hello_frame)
+                    self._set_channel(peer_id, writer)
+                    self.log(f"Dialled seed {ip}:{port}")
+                    attempt = 0  # connected, next outage starts from a short delay
+                    # Read loop is receive proposals/votes sent back to us
+                    while True:
+                        msg = await recv_msg(reader)
+                        if msg is None:
+                            break
+                        self._route_message(msg, writer)
+                except Exception as e:
+                    self.log(f"Seed link {ip}:{port} failed: {e!r}")
+                finally:
+                    # Disconnected, never leave the old conn open or registered
+                    _close(writer)
+                    self._drop_channel(peer_id, writer)
+                self.log(f"Lost connection to seed {ip}:{port} — will retry")
+            # Jitter first, then cap, so no wait exceeds REDIAL_MAX
+            delay = 1.5 ** min(attempt, 10) * random.uniform(0.5, 1.5)
+            attempt += 1
+            await asyncio.sleep(min(self.REDIAL_MAX, delay))
+
+    # Connection handler
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 conn: asyncio.StreamWriter):
         """Receive msgs from 1 accepted connec (peer or seed)."""
+        tune_socket(conn)
         peer_seed_id = None
-        while True:
-            msg = recv_msg(conn)
-            if msg is None:
-                break
-            t = msg.get("type", "")
-            if t == "SEED_HELLO":
-                # A lower-port seed connected to us
-                peer_seed_id = msg["seed_id"]
-                with self.sc_lock:
-                    self.seed_channels[peer_seed_id] = conn
-                self.log(f"Seed {peer_seed_id} connected (inbound)")
-            else:
-                self._route_message(msg, conn)
-
         try:
-            conn.close()
-        except Exception:
-            pass
-        if peer_seed_id:
-            with self.sc_lock:
-                if self.seed_channels.get(peer_seed_id) is conn:
-                    del self.seed_channels[peer_seed_id]
+            while True:
+                msg = await recv_msg(reader)
+                if msg is None:
+                    break
+                t = msg.get("type", "")
+                if t == "SEED_HELLO":
+                    # A lower-port seed connected to us
+                    peer_seed_id = sys.intern(msg["seed_id"])
+                    self._set_channel(peer_seed_id, conn)
+                    self.log(f"Seed {peer_seed_id} connected (inbound)")
+                else:
+                    self._route_message(msg, conn)
+        except Exception as e:
+            self.log(f"Connection handler failed: {e!r}")
+        finally:
+            _close(conn)
+            if peer_seed_id:
+                self._drop_channel(peer_seed_id, conn)
+
+    def _set_channel(self, seed_id: str, writer: asyncio.StreamWriter):
+        q = asyncio.Queue()
+        links = dict(self._links)
+        old = links.get(seed_id)
+        if old:
+            old[1].cancel()  # superseded channel, its writer task goes too
+        links[seed_id] = (q, self._spawn(self._link_writer(writer, q)))
+        chans = dict(self.seed_channels)
+        chans[seed_id] = writer
+        self.seed_channels = chans
+        self._links = links
+        self._seed_queues = tuple(q for q, _ in links.values())
+
+    def _drop_channel(self, seed_id: str, writer: asyncio.StreamWriter):
+        """Remove seed_id only if it still maps to this writer (not a newer one)"""
+        if self.seed_channels.get(seed_id) is not writer:
+            return
+        chans = dict(self.seed_channels)
+        del chans[seed_id]
+        links = dict(self._links)
+        links.pop(seed_id)[1].cancel()
+        self.seed_channels = chans
+        self._links = links
+        self._seed_queues = tuple(q for q, _ in links.values())
+
+    @staticmethod
+    async def _link_writer(writer: asyncio.StreamWriter, q: asyncio.Queue):
+        """Sole sender of broadcast frames on one seed channel. Frames queued
+        while the previous batch drains go out together in one writelines"""
+        try:
+            while True:
+                frames = [await q.get()]
+                while not q.empty():
+                    frames.append(q.get_nowait())
+                if writer.is_closing():
+                    return
+                writer.writelines(frames)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass  # channel lost, _drop_channel cleans up
 
     # Message routing
-    def _route_message(self, msg: dict, conn: socket.socket):
+    def _route_message(self, msg: dict, conn: asyncio.StreamWriter):
         """Dispatch received msg to the correct handler"""
-        t = msg.get("type", "")
-        if   t == "REGISTER_REQUEST":  self._on_register_request(msg, conn)
-        elif t == "REGISTER_PROPOSAL": self._on_register_proposal(msg, conn)
-        elif t == "REGISTER_VOTE":     self._on_register_vote(msg)
-        elif t == "PEER_LIST_REQUEST": self._on_peer_list_request(msg, conn)
-        elif t == "DEAD_REPORT":       self._on_dead_report(msg)
-        elif t == "DEAD_PROPOSAL":     self._on_dead_proposal(msg, conn)
-        elif t == "DEAD_VOTE":         self._on_dead_vote(msg)
-        elif t == "DEAD_CONFIRMED":
-            # Another seed committed removal before us, sync our PL
-            dead_key = (msg["dead_ip"], int(msg["dead_port"]))
-            with self.pl_lock:
-                if dead_key in self.peer_list:
-                    del self.peer_list[dead_key]
-            self.log(f"Synced removal of {dead_key} via DEAD_CONFIRMED from peer seed")
-        # Unknown messages are silently ignored
+        # a bad msg must not take down the connection or the shared loop
+        try:
+            handler = self._handlers.get(msg.get("type", ""))
+            if handler is not None:
+                handler(msg, conn)
+            # Unknown messages are silently ignored
+        except Exception as e:
+            self.log(f"Dropped malformed msg {msg!r}: {e!r}")
+
+    def _on_dead_confirmed(self, msg: dict, conn: asyncio.StreamWriter):
+        """Another seed committed removal before us, sync our PL"""
+        dead_key = (sys.intern(msg["dead_ip"]), int(msg["dead_port"]))
+        if dead_key in self.peer_list:
+            del self.peer_list[dead_key]
+            self._pl_changed()
+        self.log(f"Synced removal of {dead_key} via DEAD_CONFIRMED from peer seed")
 
     # Broadcast helpers
     def _broadcast_to_seeds(self, msg: dict):
         """Send msg to all connected peer seeds."""
-        with self.sc_lock:
-            targets = list(self.seed_channels.values())
-        for s in targets:
-            send_msg(s, msg)
+        frame = encode_frame(msg)  # once, not once per seed
+        for q in self._seed_queues:
+            q.put_nowait(frame)
 
     # Registration consensus
-    def _on_register_request(self, msg: dict, conn: socket.socket):
+    def _on_register_request(self, msg: dict, conn: asyncio.StreamWriter):
         """Peer asks to join. This seed becomes the proposer."""
-        peer_ip, peer_port = msg["ip"], int(msg["port"])
+        peer_ip, peer_port = sys.intern(msg["ip"]), int(msg["port"])
         peer_key = (peer_ip, peer_port)
 
         # Already registered?
-        with self.pl_lock:
-            if peer_key in self.peer_list:
-                self.log(f"REGISTER_REQUEST {peer_key} — already in PL, ACK")
-                send_msg(conn, {"type": "REGISTER_RESPONSE", "status": "ok",
-                                "peer_list": self._pl_excl(peer_key)})
-                return
-
-        req_id = f"reg_{peer_ip}_{peer_port}_{time.monotonic():.4f}"
+        if peer_key in self.peer_list:
+            self.log(f"REGISTER_REQUEST {peer_key} — already in PL, ACK")
+            send_msg(conn, {"type": "REGISTER_RESPONSE", "status": "ok",
+                            "peer_list": self._pl_excl(peer_key)})
+            return
+
+        req_id = f"reg_{peer_ip}_{peer_port}_{time.monotonic_ns()}"
         self.log(f"REGISTER_REQUEST {peer_key}  req_id={req_id}")
-        with self.pr_lock:
-            self.pending_reg[req_id] = {
-                "peer": peer_key,
-                "votes": {self.id: True},   # self vote
-                "conn": conn,
-                "decided": False,
-            }
-        with self.sc_lock:
-            n_ch = len(self.seed_channels)
+        self.pending_reg[req_id] = {
+            "peer": peer_key,
+            "votes": {self.id: True},   # self vote
+            "yes": 1, "no": 0,          # running tallies of votes
+            "conn": conn,
+            "decided": False,
+        }
+        n_ch = len(self.seed_channels)
         self.log(f"Broadcasting REGISTER_PROPOSAL to {n_ch} peer seed(s)  req_id={req_id}")
         self._broadcast_to_seeds({
             "type": "REGISTER_PROPOSAL",
@@ -296,10 +459,10 @@ class SeedNode:
             "proposer": self.id,
         })
         self._check_reg_quorum(req_id)   # may already pass if n_seeds==1
-        threading.Thread(target=self._reg_timeout, args=(req_id,), daemon=True).start()
+        self.loop.call_later(self.REG_TIMEOUT, self._reg_timeout, req_id)
 
-    def _on_register_proposal(self, msg: dict, conn: socket.socket):
-        """Non-proposer seed receives proposal — vote YES and reply on same socket."""
+    def _on_register_proposal(self, msg: dict, conn: asyncio.StreamWriter):
+        """Non-proposer seed receives proposal — vote YES and reply on same connection."""
         req_id   = msg["req_id"]
         proposer = msg.get("proposer", "?")
         peer_key = (msg["peer_ip"], int(msg["peer_port"]))
@@ -311,104 +474,99 @@ class SeedNode:
             "vote":    True,
         })
 
-    def _on_register_vote(self, msg: dict):
+    def _on_register_vote(self, msg: dict, conn: asyncio.StreamWriter):
         """Proposer accumulates votes."""
-        req_id, voter, vote = msg["req_id"], msg["voter"], msg["vote"]
+        req_id, voter, vote = msg["req_id"], sys.intern(msg["voter"]), msg["vote"]
         self.log(f"REGISTER_VOTE req_id={req_id} voter={voter} vote={vote}")
-        with self.pr_lock:
-            entry = self.pending_reg.get(req_id)
-            if not entry or entry["decided"]:
-                return
-            entry["votes"][voter] = vote
-        self._check_reg_quorum(req_id)
+        entry = self.pending_reg.get(req_id)
+        if not entry or entry["decided"]:
+            return
+        if self._tally(entry, voter, vote):
+            self._check_reg_quorum(req_id)
 
     def _check_reg_quorum(self, req_id: str):
-        with self.pr_lock:
-            entry = self.pending_reg.get(req_id)
-            if not entry or entry["decided"]:
-                return
-            yes = sum(1 for v in entry["votes"].values() if v)
-            no  = sum(1 for v in entry["votes"].values() if not v)
-            if yes >= self.quorum:
-                entry["decided"] = True
-                peer_key = entry["peer"]
-                conn     = entry["conn"]
-            elif no > (self.n_seeds - self.quorum):
-                entry["decided"] = True
-                conn = entry["conn"]
-                self.log(f"Registration REJECTED req_id={req_id}")
-                send_msg(conn, {"type": "REGISTER_RESPONSE", "status": "rejected"})
-                return
-            else:
-                return
+        entry = self.pending_reg.get(req_id)
+        if not entry or entry["decided"]:
+            return
+        yes, no = entry["yes"], entry["no"]
+        if yes >= self.quorum:
+            entry["decided"] = True
+            peer_key = entry["peer"]
+            conn     = entry["conn"]
+        elif no > (self.n_seeds - self.quorum):
+            entry["decided"] = True
+            conn = entry["conn"]
+            self.log(f"Registration REJECTED req_id={req_id}")
+            send_msg(conn, {"type": "REGISTER_RESPONSE", "status": "rejected"})
+            return
+        else:
+            return
 
         # Commit
-        with self.pl_lock:
-            self.peer_list[peer_key] = {"degree": 0, "registered_at": time.time()}
+        self.peer_list[peer_key] = PeerEntry(0, time.time_ns())
+        self._pl_changed()
         self.log(f"Peer {peer_key} REGISTERED  yes={yes}  PL_size={len(self.peer_list)}")
         send_msg(conn, {"type": "REGISTER_RESPONSE", "status": "ok",
                         "peer_list": self._pl_excl(peer_key)})
 
     def _reg_timeout(self, req_id: str):
-        time.sleep(10)
-        with self.pr_lock:
-            entry = self.pending_reg.get(req_id)
-            if not entry or entry["decided"]:
-                return
-            entry["decided"] = True
-            conn = entry["conn"]
+        # The round is over either way, late votes for it are dropped
+        entry = self.pending_reg.pop(req_id, None)
+        if not entry or entry["decided"]:
+            return
+        entry["decided"] = True
+        conn = entry["conn"]
         self.log(f"Registration TIMEOUT req_id={req_id}")
         send_msg(conn, {"type": "REGISTER_RESPONSE", "status": "timeout"})
 
-    # Peer list 
-    def _on_peer_list_request(self, msg: dict, conn: socket.socket):
-        requester = (msg.get("ip", ""), int(msg.get("port", 0)))
+    # Peer list
+    def _on_peer_list_request(self, msg: dict, conn: asyncio.StreamWriter):
+        requester = (sys.intern(msg.get("ip", "")), int(msg.get("port", 0)))
         self.log(f"PEER_LIST_REQUEST from {requester}")
         send_msg(conn, {"type": "PEER_LIST_RESPONSE",
                         "peer_list": self._pl_excl(requester)})
 
+    def _pl_changed(self):
+        self._pl_cache = [{"ip": ip, "port": port, "degree": e.degree}
+                          for (ip, port), e in self.peer_list.items()]
+
     def _pl_serialised(self) -> list:
-        with self.pl_lock:
-            return [{"ip": ip, "port": port, "degree": m["degree"]}
-                    for (ip, port), m in self.peer_list.items()]
+        return list(self._pl_cache)
 
     def _pl_excl(self, exclude: tuple) -> list:
-        with self.pl_lock:
-            return [{"ip": ip, "port": port, "degree": m["degree"]}
-                    for (ip, port), m in self.peer_list.items()
-                    if (ip, port) != exclude]
-
-    # Dead node consensus 
-    def _on_dead_report(self, msg: dict):
-        dead_key = (msg["dead_ip"], int(msg["dead_port"]))
+        ip, port = exclude
+        return [d for d in self._pl_cache
+                if d["port"] != port or d["ip"] != ip]
+
+    # Dead node consensus
+    def _on_dead_report(self, msg: dict, conn: asyncio.StreamWriter):
+        dead_key = (sys.intern(msg["dead_ip"]), int(msg["dead_port"]))
         reporter = msg["reporter"]
         self.log(f"DEAD_REPORT  dead={dead_key}  reporter={reporter}")
-        # The peers already achieved consensus, so the seed only needs ONE report 
+        # The peers already achieved consensus, so the seed only needs ONE report
         # to trigger the seed level vote.
-        with self.dr_lock:
-            if dead_key not in self.dead_reports:
-                self.dead_reports[dead_key] = set()
-            
-            # If we have already proposed this recently, don't spam the network
-            if reporter in self.dead_reports[dead_key]:
-                return
-                
-            self.dead_reports[dead_key].add(reporter)
-            
+        if dead_key not in self.dead_reports:
+            self.dead_reports[dead_key] = set()
+
+        # If we have already proposed this recently, don't spam the network
+        if reporter in self.dead_reports[dead_key]:
+            return
+
+        self.dead_reports[dead_key].add(reporter)
+
         self._propose_removal(dead_key)
 
     def _propose_removal(self, dead_key: tuple):
-        with self.pl_lock:
-            if dead_key not in self.peer_list:
-                return
-        req_id = f"rem_{dead_key[0]}_{dead_key[1]}_{time.monotonic():.4f}"
+        if dead_key not in self.peer_list:
+            return
+        req_id = f"rem_{dead_key[0]}_{dead_key[1]}_{time.monotonic_ns()}"
         self.log(f"DEAD_PROPOSAL req_id={req_id}  dead={dead_key}")
-        with self.prem_lock:
-            self.pending_rem[req_id] = {
-                "peer":    dead_key,
-                "votes":   {self.id: True},
-                "decided": False,
-            }
+        self.pending_rem[req_id] = {
+            "peer":    dead_key,
+            "votes":   {self.id: True},
+            "yes": 1, "no": 0,
+            "decided": False,
+        }
         self._broadcast_to_seeds({
             "type":     "DEAD_PROPOSAL",
             "req_id":   req_id,
@@ -417,9 +575,9 @@ class SeedNode:
             "proposer": self.id,
         })
         self._check_rem_quorum(req_id)
-        threading.Thread(target=self._rem_timeout, args=(req_id,), daemon=True).start()
+        self.loop.call_later(self.REM_TIMEOUT, self._rem_timeout, req_id)
 
-    def _on_dead_proposal(self, msg: dict, conn: socket.socket):
+    def _on_dead_proposal(self, msg: dict, conn: asyncio.StreamWriter):
         req_id = msg["req_id"]
         self.log(f"DEAD_PROPOSAL received req_id={req_id} → YES")
         send_msg(conn, {
@@ -431,32 +589,36 @@ class SeedNode:
             "dead_port":msg["dead_port"],
         })
 
-    def _on_dead_vote(self, msg: dict):
-        req_id, voter, vote = msg["req_id"], msg["voter"], msg["vote"]
+    def _on_dead_vote(self, msg: dict, conn: asyncio.StreamWriter):
+        req_id, voter, vote = msg["req_id"], sys.intern(msg["voter"]), msg["vote"]
         self.log(f"DEAD_VOTE req_id={req_id} voter={voter} vote={vote}")
-        with self.prem_lock:
-            entry = self.pending_rem.get(req_id)
-            if not entry or entry["decided"]:
-                return
-            entry["votes"][voter] = vote
-        self._check_rem_quorum(req_id)
+        entry = self.pending_rem.get(req_id)
+        if not entry or entry["decided"]:
+            return
+        if self._tally(entry, voter, vote):
+            self._check_rem_quorum(req_id)
+
+    @staticmethod
+    def _tally(entry: dict, voter: str, vote: bool) -> bool:
+        """Count a voter's first vote only. False if it was a repeat"""
+        if voter in entry["votes"]:
+            return False
+        entry["votes"][voter] = vote
+        entry["yes" if vote else "no"] += 1
+        return True
 
     def _check_rem_quorum(self, req_id: str):
-        with self.prem_lock:
-            entry = self.pending_rem.get(req_id)
-            if not entry or entry["decided"]:
-                return
-            yes = sum(1 for v in entry["votes"].values() if v)
-            if yes >= self.quorum:
-                entry["decided"] = True
-                dead_key = entry["peer"]
-            else:
-                return
-        with self.pl_lock:
-            removed = dead_key in self.peer_list
-            if removed:
-                del self.peer_list[dead_key]
-        if removed:
+        entry = self.pending_rem.get(req_id)
+        if not entry or entry["decided"]:
+            return
+        if entry["yes"] >= self.quorum:
+            entry["decided"] = True
+            dead_key = entry["peer"]
+        else:
+            return
+        if dead_key in self.peer_list:
+            del self.peer_list[dead_key]
+            self._pl_changed()
             self.log(f"Peer {dead_key} REMOVED from PL  req_id={req_id}  PL_size={len(self.peer_list)}")
             self._broadcast_to_seeds({
                 "type":     "DEAD_CONFIRMED",
@@ -465,12 +627,10 @@ class SeedNode:
             })
 
     def _rem_timeout(self, req_id: str):
-        time.sleep(10)
-        with self.prem_lock:
-            entry = self.pending_rem.get(req_id)
-            if entry and not entry["decided"]:
-                entry["decided"] = True
-                self.log(f"Removal TIMEOUT req_id={req_id}")
+        entry = self.pending_rem.pop(req_id, None)
+        if entry and not entry["decided"]:
+            entry["decided"] = True
+            self.log(f"Removal TIMEOUT req_id={req_id}")
 
 
 # Entry point